@@ -1,10 +1,13 @@
+import io
 import os
 import re
-import glob
-import itertools
 import json
+import hashlib
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 import streamlit as st
-from openai import OpenAI
+from PIL import Image
 
 # ===============================
 # Page setup
@@ -18,19 +21,51 @@ st.set_page_config(
 # ===============================
 # OpenAI client (from Secrets)
 # ===============================
-client = None
-OPENAI_KEY = st.secrets.get("OPENAI_API_KEY", "")
-if OPENAI_KEY:
+OPENAI_MAX_RETRIES = 3
+
+@st.cache_resource
+def get_client():
+    """
+    Build the OpenAI client once per process, or None without a usable key.
+    """
+    key = st.secrets.get("OPENAI_API_KEY", "")
+    if not key:
+        return None
     try:
-        client = OpenAI(api_key=OPENAI_KEY)
+        from openai import OpenAI
+        # The SDK retries transient errors (429, 5xx, timeouts) with backoff.
+        return OpenAI(api_key=key, max_retries=OPENAI_MAX_RETRIES)
     except Exception:
-        client = None  # We'll show a friendly message in the UI
+        return None  # We'll show a friendly message in the UI
+
+# Only the key is checked here; the client is built on first use.
+OPENAI_ENABLED = bool(st.secrets.get("OPENAI_API_KEY", ""))
 
 VOICE = st.secrets.get("VOICE", "verse")  # try "verse", "alloy", or "aria"
 
+TTS_MODEL = "gpt-4o-mini-tts"
+TTS_CACHE_DIR = ".tts_cache"
+PREBUILT_AUDIO_DIR = os.path.join("slides", "audio")  # written by scripts/prebuild_tts.py
+
+SLIDE_EXTS = (".png", ".jpg")
+SLIDE_MAX_WIDTH = 1280  # px; wide enough for the 2/3-width slide column
+_DIGITS = re.compile(r"\d+")
+_FIRST_SENTENCE = re.compile(r"(?<=[.!?])\s")
+
+CHAT_HISTORY_TURNS = 6  # user/assistant pairs sent with each question
+HISTORY_TOKEN_BUDGET = 3000  # rough cap on tokens of history sent with a question
+TRANSCRIPT_TAIL = 20  # messages rendered without expanding the history
+SUMMARY_STEP = 4  # re-summarize once this many more messages leave the window
+
+EMBED_MODEL = "text-embedding-3-small"
+QA_CACHE_MIN_SIMILARITY = 0.92  # cosine; near-paraphrases score above this
+QA_CACHE_MAX_ENTRIES = 200  # semantic cache entries kept (~50 KB each)
+ANSWER_CACHE_MAX_ENTRIES = 500  # exact-match answers kept, least recently used evicted
+
 # ===============================
 # Helpers
 # ===============================
+@st.cache_resource
 def load_narration() -> dict:
     """
     Load narration from narration.json at repo root.
@@ -44,86 +79,388 @@ def load_narration() -> dict:
         st.warning(f"Failed to load narration.json: {e}")
         return {}
 
-def discover_slides(folder: str = "slides") -> list:
+def mtime_ns(path: str) -> int:
     """
-    Find slide images and return a naturally sorted list by first number in filename.
-    Supports .png/.jpg (any case).
+    Modification time of a file or folder, 0 if it doesn't exist.
     """
-    patterns = [
-        os.path.join(folder, "*.png"),
-        os.path.join(folder, "*.PNG"),
-        os.path.join(folder, "*.jpg"),
-        os.path.join(folder, "*.JPG"),
-        os.path.join(folder, "Slide*.png"),
-        os.path.join(folder, "Slide*.PNG"),
-    ]
-    all_files = set(itertools.chain.from_iterable(glob.glob(p) for p in patterns))
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return 0
+
+@st.cache_data(show_spinner=False)
+def discover_slides(folder: str = "slides", folder_mtime_ns: int = 0) -> list:
+    """
+    Find slide images and return {"path", "slide_num"} dicts, naturally sorted
+    by first number in filename. Supports .png/.jpg (any case); .jpg wins a tie.
+    """
+    by_stem = {}
+    try:
+        with os.scandir(folder) as it:
+            for e in it:
+                stem, ext = os.path.splitext(e.name)
+                ext = ext.lower()
+                if ext in SLIDE_EXTS and e.is_file():
+                    if ext == ".jpg" or stem not in by_stem:
+                        by_stem[stem] = e.path
+    except FileNotFoundError:
+        return []
+    all_files = list(by_stem.values())
     def numeric_key(path: str) -> int:
-        m = re.search(r"(\d+)", os.path.basename(path))
-        return int(m.group(1)) if m else 0
-    return sorted(all_files, key=numeric_key)
+        m = _DIGITS.search(os.path.basename(path))
+        return int(m.group()) if m else 0
+    return [
+        {"path": p, "slide_num": slide_key_for(p, i)}
+        for i, p in enumerate(sorted(all_files, key=numeric_key))
+    ]
 
 def slide_key_for(path: str, idx: int) -> str:
     """
     Derive a 2-digit narration key from a slide filename.
     If no digits are present, fall back to 1-based index.
     """
-    m = re.search(r"(\d+)", os.path.basename(path))
-    n = int(m.group(1)) if m else (idx + 1)
+    m = _DIGITS.search(os.path.basename(path))
+    n = int(m.group()) if m else (idx + 1)
     return f"{n:02d}"
 
+@st.cache_data(show_spinner=False)
+def load_slide_bytes(path: str, file_mtime_ns: int, width: int = SLIDE_MAX_WIDTH) -> tuple:
+    """
+    Slide image as (bytes, format), downscaled to at most `width` px:
+    PNG if it may have transparency, else JPEG.
+    """
+    with Image.open(path) as img:
+        fmt = "PNG" if img.mode in ("RGBA", "LA", "P") else "JPEG"
+        if img.format == fmt and img.width <= width:
+            with open(path, "rb") as f:
+                return f.read(), fmt
+        img.thumbnail((width, width * 4), Image.LANCZOS)
+        buf = io.BytesIO()
+        if fmt == "JPEG":
+            img.convert("RGB").save(buf, format="JPEG", quality=90)
+        else:
+            img.save(buf, format="PNG", optimize=True)
+        return buf.getvalue(), fmt
+
+@st.cache_data
 def find_avatar() -> str | None:
     for cand in ("slides/avatar.jpg", "slides/avatar.png", "avatar.jpg", "avatar.png"):
         if os.path.exists(cand):
             return cand
     return None
 
+@st.cache_data(show_spinner=False)
+def prebuilt_audio(key: str) -> str | None:
+    """
+    Path of the offline-rendered MP3 for a slide key, if one was checked in.
+    """
+    path = os.path.join(PREBUILT_AUDIO_DIR, f"{key}.mp3")
+    return path if os.path.exists(path) else None
+
+def tts_cache_path(text: str, voice: str, model: str = TTS_MODEL) -> str:
+    """
+    On-disk location of the MP3 for a given narration/voice/model combo.
+    """
+    key = hashlib.sha256(f"{voice}|{model}|{text}".encode("utf-8")).hexdigest()
+    return os.path.join(TTS_CACHE_DIR, f"{key}.mp3")
+
+def synthesize_to_disk(api_client, text: str, voice: str, model: str = TTS_MODEL) -> bytes:
+    """
+    Return MP3 bytes for the narration, synthesizing it into .tts_cache/ on a miss.
+    """
+    path = tts_cache_path(text, voice, model)
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            return f.read()
+    os.makedirs(TTS_CACHE_DIR, exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        # Stream straight to disk rather than buffering the whole MP3 in memory.
+        with api_client.audio.speech.with_streaming_response.create(
+            model=model, voice=voice, input=text,
+        ) as resp, open(tmp, "wb") as f:
+            for chunk in resp.iter_bytes(chunk_size=8192):
+                f.write(chunk)
+        os.replace(tmp, path)  # atomic, so readers never see a half-written file
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    with open(path, "rb") as f:
+        return f.read()
+
+@st.cache_resource(show_spinner=False)
+def tts_worker() -> tuple:
+    """
+    TTS thread pool, the in-flight futures keyed by cache path, and their lock.
+    """
+    return ThreadPoolExecutor(max_workers=8, thread_name_prefix="tts"), {}, threading.Lock()
+
+def schedule_tts(api_client, text: str, voice: str, model: str = TTS_MODEL):
+    """
+    Queue background synthesis unless the MP3 is on disk. Returns the
+    in-flight future (possibly an existing one), or None.
+    """
+    pool, inflight, lock = tts_worker()
+    path = tts_cache_path(text, voice, model)
+    with lock:
+        if path in inflight:
+            return inflight[path]
+        if os.path.exists(path):
+            return None
+        fut = pool.submit(synthesize_to_disk, api_client, text, voice, model)
+        inflight[path] = fut
+    def _done(_fut):
+        with lock:
+            inflight.pop(path, None)
+    fut.add_done_callback(_done)
+    return fut
+
+@st.cache_data(show_spinner=False)
+def synthesize(text: str, voice: str, model: str = TTS_MODEL) -> bytes:
+    """
+    MP3 bytes for the narration: waits on a started background job,
+    else synthesizes inline.
+    """
+    api_client = get_client()
+    fut = schedule_tts(api_client, text, voice, model)
+    if fut is not None and (fut.running() or not fut.cancel()):
+        return fut.result()
+    return synthesize_to_disk(api_client, text, voice, model)
+
+@st.cache_resource(show_spinner=False)
+def prewarm_tts(keys: tuple, voice: str, model: str = TTS_MODEL) -> None:
+    """
+    Queue narration audio for every slide without prebuilt audio, once per process.
+    """
+    api_client = get_client()
+    if api_client is None:
+        return
+    for k in keys:
+        if k in NARR and not prebuilt_audio(k):
+            schedule_tts(api_client, NARR[k], voice, model)
+
+def prefetch_neighbors(idx: int) -> None:
+    """
+    Queue audio for the previous and next two slides.
+    """
+    api_client = get_client()
+    if api_client is None:
+        return
+    for j in (idx - 1, idx + 1, idx + 2):
+        if 0 <= j < len(slides):
+            key = slides[j]["slide_num"]
+            text = NARR.get(key)
+            if text and not prebuilt_audio(key):
+                schedule_tts(api_client, text, VOICE)
+
+@st.cache_data
+def build_system_prompt(narr: dict) -> str:
+    """
+    System prompt for the Q&A chat: TA instructions plus a one-line
+    outline of the lecture.
+    """
+    outline = "\n".join(
+        f"Slide {k}: {_FIRST_SENTENCE.split(v.strip(), maxsplit=1)[0]}"
+        for k, v in sorted(narr.items())
+    )
+    return (
+        "You are a helpful TA for INFO 300. "
+        "Answer concisely and stay on-topic about the TCP/IP model (5-layer).\n\n"
+        f"Today's lecture outline:\n{outline}"
+    )
+
+@st.cache_resource
+def qa_cache() -> tuple:
+    """
+    Shared semantic cache of recent (embedding, question, answer) entries, and its lock.
+    """
+    return deque(maxlen=QA_CACHE_MAX_ENTRIES), threading.Lock()
+
+def embed(api_client, text: str) -> list:
+    resp = api_client.embeddings.create(model=EMBED_MODEL, input=text)
+    return resp.data[0].embedding
+
+def lookup_answer(embedding: list) -> str | None:
+    """
+    Return the cached answer whose question is most similar to this one,
+    if it clears QA_CACHE_MIN_SIMILARITY.
+    """
+    entries, lock = qa_cache()
+    with lock:
+        snapshot = list(entries)
+    best, best_sim = None, QA_CACHE_MIN_SIMILARITY
+    for vec, _q, answer in snapshot:
+        sim = sum(a * b for a, b in zip(vec, embedding))
+        if sim >= best_sim:
+            best, best_sim = answer, sim
+    return best
+
+def remember_answer(embedding: list, question: str, answer: str) -> None:
+    entries, lock = qa_cache()
+    with lock:
+        entries.append((embedding, question, answer))
+
+@st.cache_resource
+def answer_cache() -> tuple:
+    """
+    Shared LRU of {request hash: answer}, and its lock.
+    """
+    return OrderedDict(), threading.Lock()
+
+def cached_answer(key: str) -> str | None:
+    answers, lock = answer_cache()
+    with lock:
+        if key not in answers:
+            return None
+        answers.move_to_end(key)
+        return answers[key]
+
+def store_answer(key: str, answer: str) -> None:
+    answers, lock = answer_cache()
+    with lock:
+        answers[key] = answer
+        answers.move_to_end(key)
+        if len(answers) > ANSWER_CACHE_MAX_ENTRIES:
+            answers.popitem(last=False)
+
+def conversation_key(messages: list) -> str:
+    """
+    Hash of a chat request, with the question case- and whitespace-normalized.
+    """
+    *context, question = messages
+    question = {**question, "content": " ".join(question["content"].lower().split())}
+    payload = json.dumps([*context, question], ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+@st.cache_resource
+def summary_pool() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=2, thread_name_prefix="summary")
+
+def summarize_turns(api_client, previous: str, turns: list) -> str:
+    """
+    Fold chat turns into the running summary.
+    """
+    transcript = "\n".join(f"{m['role']}: {m['content']}" for m in turns)
+    resp = api_client.chat.completions.create(
+        model="gpt-4o-mini",
+        messages=[
+            {"role": "system", "content": (
+                "Summarize this classroom Q&A about the TCP/IP model in a few sentences. "
+                "Keep any facts or examples a later question might refer back to."
+            )},
+            {"role": "user", "content": (
+                f"Summary so far:\n{previous or '(none)'}\n\nNew turns:\n{transcript}"
+            )},
+        ],
+        temperature=0,
+        max_tokens=300,
+    )
+    return resp.choices[0].message.content.strip()
+
+def summary_and_history(api_client, earlier: list) -> tuple:
+    """
+    Split the messages before a question into (summary of earlier[:upto],
+    recent history after it), refreshing the summary in the background.
+    """
+    state = st.session_state.history_summary
+    fut = state["future"]
+    if fut is not None and fut.done():
+        state["future"] = None
+        try:
+            state["text"], state["upto"] = fut.result()
+        except Exception:
+            pass  # keep the previous summary; retried on a later turn
+    history = recent_history(earlier[state["upto"]:])
+    start = len(earlier) - len(history)
+    if state["future"] is None and start - state["upto"] >= SUMMARY_STEP:
+        previous, new_turns = state["text"], earlier[state["upto"]:start]
+        state["future"] = summary_pool().submit(
+            lambda: (summarize_turns(api_client, previous, new_turns), start)
+        )
+    return state["text"], history
+
+def approx_tokens(text: str) -> int:
+    """
+    Rough token count: about 4 characters per token.
+    """
+    return len(text) // 4 + 4  # + per-message overhead
+
+def recent_history(earlier: list) -> list:
+    """
+    The last CHAT_HISTORY_TURNS turns, trimmed from the oldest to fit
+    HISTORY_TOKEN_BUDGET.
+    """
+    history = earlier[-2 * CHAT_HISTORY_TURNS:]
+    total = sum(approx_tokens(m["content"]) for m in history)
+    while history and total > HISTORY_TOKEN_BUDGET:
+        total -= approx_tokens(history.pop(0)["content"])
+    return history
+
 # ===============================
 # Data
 # ===============================
 NARR = load_narration()
-slide_imgs = discover_slides()
+slides = discover_slides("slides", mtime_ns("slides"))
 
 # ===============================
 # Session state
 # ===============================
-if "idx" not in st.session_state:
-    st.session_state.idx = 0
-if "messages" not in st.session_state:
-    st.session_state.messages = []
-if "tts_cache" not in st.session_state:
-    st.session_state.tts_cache = {}  # { "02": b"<mp3 bytes>" }
+def init_state() -> None:
+    """
+    Seed per-session defaults.
+    """
+    defaults = {
+        "idx": 0,
+        "nav_select": 0,  # sidebar selectbox value, kept equal to idx by go_to()
+        "messages": [],
+        "pending_q": None,  # question still awaiting its answer
+        "history_summary": {"upto": 0, "text": "", "future": None},
+    }
+    for k, v in defaults.items():
+        st.session_state.setdefault(k, v)
+
+init_state()
 
 # ===============================
 # Sidebar: slide navigator
 # ===============================
+def go_to(i: int) -> None:
+    """
+    Callback: move to slide i, clamped to the deck, and sync the sidebar.
+    """
+    st.session_state.idx = max(0, min(len(slides) - 1, i))
+    st.session_state.nav_select = st.session_state.idx
+
 st.sidebar.title("Slides")
-if slide_imgs:
-    for i, path in enumerate(slide_imgs):
-        label = slide_key_for(path, i)
-        if st.sidebar.button(f"Slide {label}", key=f"nav_{i}"):
-            st.session_state.idx = i
-            st.rerun()
+if slides:
+    # A fixed key keeps the widget's identity stable as idx changes.
+    st.sidebar.selectbox(
+        "Jump to slide",
+        range(len(slides)),
+        key="nav_select",
+        format_func=lambda i: f"Slide {slides[i]['slide_num']}",
+        on_change=lambda: go_to(st.session_state.nav_select),
+    )
 else:
     st.sidebar.info("No slides detected. Put PNG/JPG files in the `slides/` folder.")
 
 # ===============================
 # Layout
 # ===============================
-left, right = st.columns([2, 1])
-
-# ----- LEFT column: slides, narration, audio, nav -----
-with left:
-    st.title("INFO 300 — TCP/IP Model (5-layer)")
-
-    if not slide_imgs:
+@st.fragment
+def slide_panel() -> None:
+    """
+    Slide, narration and audio controls (a fragment).
+    """
+    if not slides:
         st.warning("No slides found. Please place PNG/JPGs in the 'slides/' folder.")
     else:
-        cur = slide_imgs[st.session_state.idx]
-        key = slide_key_for(cur, st.session_state.idx)
+        cur = slides[st.session_state.idx]["path"]
+        key = slides[st.session_state.idx]["slide_num"]
 
         st.markdown(f"### Slide {key}")
-        st.image(cur, use_container_width=True)
+        slide_bytes, slide_fmt = load_slide_bytes(cur, mtime_ns(cur))
+        st.image(slide_bytes, output_format=slide_fmt, use_container_width=True)
 
         st.markdown("#### Narration")
         narration_text = NARR.get(key, "No narration found for this slide.")
@@ -132,74 +469,131 @@ with left:
         # Audio narration (text-to-speech)
         c1, c2, _ = st.columns([1, 1, 3])
         if c1.button("▶️ Play audio narration", key=f"tts_{key}", use_container_width=True):
-            if not client:
+            prebuilt = prebuilt_audio(key)
+            if prebuilt:
+                st.audio(prebuilt, format="audio/mp3")
+            elif get_client() is None:
                 st.warning("OpenAI key missing or invalid — cannot synthesize audio.")
             else:
-                if key not in st.session_state.tts_cache:
-                    try:
-                        speech = client.audio.speech.create(
-                            model="gpt-4o-mini-tts",
-                            voice=VOICE,
-                            input=narration_text,
-                        )
-                        audio_bytes = speech.content  # recent SDKs return bytes here
-                        st.session_state.tts_cache[key] = audio_bytes
-                    except Exception as e:
-                        st.error(f"Audio synthesis failed: {e}")
-                if st.session_state.tts_cache.get(key):
-                    st.audio(st.session_state.tts_cache[key], format="audio/mp3")
-
-        if c2.button("⟲ Regenerate audio", key=f"tts_regen_{key}", use_container_width=True) and client:
-            st.session_state.tts_cache.pop(key, None)
-            st.rerun()
-
-        # Prev / Next
-        n1, n2, n3 = st.columns([1, 4, 1])
-        if n1.button("⬅️ Prev", use_container_width=True):
-            st.session_state.idx = max(0, st.session_state.idx - 1)
-            st.rerun()
-        n2.caption(f"Slide {st.session_state.idx + 1} of {len(slide_imgs)}")
-        if n3.button("Next ➡️", use_container_width=True):
-            st.session_state.idx = min(len(slide_imgs) - 1, st.session_state.idx + 1)
-            st.rerun()
-
-# ----- RIGHT column: avatar + Q&A -----
-with right:
-    avatar = find_avatar()
-    if avatar:
-        st.image(avatar, caption="Professor McGarry", width=160)
+                try:
+                    st.audio(synthesize(narration_text, VOICE), format="audio/mp3")
+                except Exception as e:
+                    st.error(f"Audio synthesis failed: {e}")
 
-    st.header("Q&A (in-class)")
-    st.caption("Ask about today’s TCP/IP lecture (5-layer model). Keep questions on topic.")
+        if c2.button("⟲ Regenerate audio", key=f"tts_regen_{key}", use_container_width=True) and OPENAI_ENABLED:
+            try:
+                os.remove(tts_cache_path(narration_text, VOICE))
+            except FileNotFoundError:
+                pass
+            synthesize.clear()
+            st.rerun(scope="fragment")
 
-    for m in st.session_state.messages:
+@st.fragment
+def qa_panel() -> None:
+    """
+    Chat transcript, input and answers (a fragment).
+    """
+    # Render only the tail of a long transcript unless asked for more.
+    shown = st.session_state.messages
+    hidden = len(shown) - TRANSCRIPT_TAIL
+    if hidden > 0 and not st.toggle(f"Show {hidden} earlier messages", key="show_earlier"):
+        shown = shown[-TRANSCRIPT_TAIL:]
+    for m in shown:
         if m["role"] in ("user", "assistant"):
             with st.chat_message("user" if m["role"] == "user" else "assistant"):
                 st.write(m["content"])
 
-    prompt = st.chat_input("Ask a question about the TCP/IP model…", disabled=(client is None))
-    if prompt and not client:
+    prompt = st.chat_input("Ask a question about the TCP/IP model…", disabled=not OPENAI_ENABLED)
+    if prompt and not OPENAI_ENABLED:
         st.info("OpenAI key missing — add it under Settings → Secrets to enable chat.")
-    elif prompt and client:
+    elif prompt and OPENAI_ENABLED:
         st.session_state.messages.append({"role": "user", "content": prompt})
+        st.session_state.pending_q = prompt
         with st.chat_message("user"):
             st.write(prompt)
-        try:
-            resp = client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": (
-                        "You are a helpful TA for INFO 300. "
-                        "Answer concisely and stay on-topic about the TCP/IP model (5-layer)."
-                    )},
-                    *st.session_state.messages,
-                ],
-                temperature=0.3,
-            )
-            answer = resp.choices[0].message.content
-        except Exception as e:
-            answer = f"(Error contacting OpenAI: {e})"
-        st.session_state.messages.append({"role": "assistant", "content": answer})
+
+    # A question sent while an answer is streaming queues behind that run.
+    # Only a full-page rerun (slide navigation) can cut an answer short; its
+    # question stays pending and is answered again here.
+    pending = st.session_state.pending_q
+    api_client = get_client() if pending else None
+    if pending and api_client is None:
+        st.info("OpenAI key missing or invalid — check it under Settings → Secrets to enable chat.")
+        st.session_state.pending_q = None
+    elif pending:
+        earlier = st.session_state.messages[:-1]
+        summary, history = summary_and_history(api_client, earlier)
+        api_messages = [
+            {"role": "system", "content": build_system_prompt(NARR)},
+            *([{"role": "system", "content": f"Summary of the earlier discussion: {summary}"}]
+              if summary else []),
+            *history,
+            {"role": "user", "content": pending},
+        ]
+        convo_key = conversation_key(api_messages)
+        cached = cached_answer(convo_key)
+        # Follow-ups lean on earlier turns, so only a conversation's opening
+        # question is answered from (and added to) the shared semantic cache.
+        embedding = None
+        if not cached and not earlier:
+            try:
+                embedding = embed(api_client, pending)
+                cached = lookup_answer(embedding)
+            except Exception:
+                embedding = None  # cache is best-effort; fall through to the model
         with st.chat_message("assistant"):
-            st.write(answer)
+            if cached:
+                answer = cached
+                st.write(answer)
+            else:
+                try:
+                    stream = api_client.chat.completions.create(
+                        model="gpt-4o-mini",
+                        messages=api_messages,
+                        temperature=0,  # deterministic, so a cached answer is the answer
+                        stream=True,
+                    )
+                    answer = st.write_stream(
+                        chunk.choices[0].delta.content or ""
+                        for chunk in stream if chunk.choices
+                    )
+                    store_answer(convo_key, answer)
+                    if embedding:
+                        remember_answer(embedding, pending, answer)
+                except Exception as e:
+                    answer = f"(Error contacting OpenAI: {e})"
+                    st.write(answer)
+        st.session_state.messages.append({"role": "assistant", "content": answer})
+        st.session_state.pending_q = None
+
+left, right = st.columns([2, 1])
+
+# ----- LEFT column: slides, narration, audio, nav -----
+with left:
+    st.title("INFO 300 — TCP/IP Model (5-layer)")
+    slide_panel()
+
+    # Prev / Next
+    if slides:
+        n1, n2, n3 = st.columns([1, 4, 1])
+        n1.button("⬅️ Prev", on_click=go_to, args=(st.session_state.idx - 1,),
+                  use_container_width=True)
+        n2.caption(f"Slide {st.session_state.idx + 1} of {len(slides)}")
+        n3.button("Next ➡️", on_click=go_to, args=(st.session_state.idx + 1,),
+                  use_container_width=True)
+
+# ----- RIGHT column: avatar + Q&A -----
+with right:
+    avatar = find_avatar()
+    if avatar:
+        st.image(avatar, caption="Professor McGarry", width=160)
+
+    st.header("Q&A (in-class)")
+    st.caption("Ask about today’s TCP/IP lecture (5-layer model). Keep questions on topic.")
+
+    qa_panel()
 
+# Audio warm-up runs last, after the page has been drawn.
+if OPENAI_ENABLED:
+    prefetch_neighbors(st.session_state.idx)
+    prewarm_tts(tuple(s["slide_num"] for s in slides), VOICE)
@@ -0,0 +1,55 @@
+"""
+Convert exported PNG slides to width-capped JPEG, once, before deploying.
+
+For every opaque slides/*.png this writes a sibling .jpg (Slide3.png ->
+Slide3.jpg) no wider than --width pixels. app.py picks the .jpg over the
+.png when both exist and, because st.image serves JPEG as-is, sends those
+bytes straight to the browser with no per-process decode/resize/encode.
+Slides with transparency are skipped (they are served as PNG). Originals
+are left untouched.
+
+Requires Pillow (see requirements.txt).
+
+Usage (from the repo root):
+    python scripts/optimize_slides.py [--width 1280] [--quality 90]
+"""
+import argparse
+import os
+
+from PIL import Image
+
+SOURCE_EXTS = (".png",)
+SLIDE_MAX_WIDTH = 1280  # keep in sync with SLIDE_MAX_WIDTH in app.py
+
+
+def convert(path: str, width: int, quality: int) -> str | None:
+    out = os.path.splitext(path)[0] + ".jpg"
+    with Image.open(path) as img:
+        if img.mode in ("RGBA", "LA", "P"):  # may be transparent; app serves it as PNG
+            return None
+        img = img.convert("RGB")
+        if img.width > width:  # never upscale
+            img = img.resize((width, round(img.height * width / img.width)), Image.LANCZOS)
+        img.save(out, "JPEG", quality=quality)
+    return out
+
+
+def main(folder: str, width: int, quality: int) -> None:
+    for name in sorted(os.listdir(folder)):
+        if not name.lower().endswith(SOURCE_EXTS):
+            continue
+        src = os.path.join(folder, name)
+        out = convert(src, width, quality)
+        if out is None:
+            print(f"{src}: has transparency, skipped")
+            continue
+        print(f"{src} ({os.path.getsize(src):,} B) -> {out} ({os.path.getsize(out):,} B)")
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--folder", default="slides")
+    ap.add_argument("--width", type=int, default=SLIDE_MAX_WIDTH)
+    ap.add_argument("--quality", type=int, default=90)
+    args = ap.parse_args()
+    main(args.folder, args.width, args.quality)
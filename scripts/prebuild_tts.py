@@ -0,0 +1,70 @@
+"""
+Pre-render narration audio for every slide, offline.
+
+Reads narration.json and writes slides/audio/<NN>.mp3 (e.g. slides/audio/02.mp3).
+app.py plays these files directly, so a deployed lecture never calls the
+TTS API. Requests are sent concurrently with AsyncOpenAI, at most
+MAX_CONCURRENCY at a time.
+
+Usage (from the repo root):
+    OPENAI_API_KEY=sk-... python scripts/prebuild_tts.py [--voice verse]
+
+Re-run it after editing narration.json; existing files are overwritten.
+"""
+import argparse
+import asyncio
+import json
+import os
+
+from openai import AsyncOpenAI
+
+MODEL = "gpt-4o-mini-tts"
+MAX_CONCURRENCY = 8  # stay well under the account's TTS rate limit
+MAX_RETRIES = 5  # SDK backoff on 429/5xx; a batch job can afford to wait
+
+
+def load_narration(path: str) -> dict:
+    """
+    Same normalization as app.py: keys become 2 digits ("2" -> "02").
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return {str(k).zfill(2): v for k, v in data.items()}
+
+
+async def render_one(aclient: AsyncOpenAI, sem: asyncio.Semaphore, key: str, text: str,
+                     voice: str, out_dir: str) -> str:
+    async with sem:
+        speech = await aclient.audio.speech.create(model=MODEL, voice=voice, input=text)
+    path = os.path.join(out_dir, f"{key}.mp3")
+    with open(path, "wb") as f:
+        f.write(speech.content)
+    return path
+
+
+async def main(narration: str, out_dir: str, voice: str) -> int:
+    narr = load_narration(narration)
+    os.makedirs(out_dir, exist_ok=True)
+    sem = asyncio.Semaphore(MAX_CONCURRENCY)
+    async with AsyncOpenAI(max_retries=MAX_RETRIES) as aclient:
+        results = await asyncio.gather(
+            *(render_one(aclient, sem, k, t, voice, out_dir) for k, t in narr.items()),
+            return_exceptions=True,
+        )
+    failed = 0
+    for key, res in zip(narr, results):
+        if isinstance(res, Exception):
+            failed += 1
+            print(f"Slide {key}: FAILED ({res})")
+        else:
+            print(f"Slide {key}: {res}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--narration", default="narration.json")
+    ap.add_argument("--out", default=os.path.join("slides", "audio"))
+    ap.add_argument("--voice", default="verse", help='should match VOICE in Secrets (default "verse")')
+    args = ap.parse_args()
+    raise SystemExit(asyncio.run(main(args.narration, args.out, args.voice)))